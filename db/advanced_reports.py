@@ -1,10 +1,11 @@
-import os, pandas as pd, matplotlib.pyplot as plt
+import os, sys, pandas as pd, matplotlib.pyplot as plt
 import seaborn as sns
-from sqlalchemy import create_engine
 from datetime import datetime
 import glob
 import shutil
 
+import shards
+
 # Create reports directory if it doesn't exist
 REPORTS_DIR = "reports"
 os.makedirs(REPORTS_DIR, exist_ok=True)
@@ -29,22 +30,21 @@ plt.style.use('ggplot')
 sns.set_palette("deep")
 
 # ---------- 1. connection ----------
-url = (
-    f"mysql+mysqlconnector://{os.getenv('MYSQL_USER','travel_admin')}:"
-    f"{os.getenv('MYSQL_PASSWORD','travel_pw')}@"
-    f"{os.getenv('MYSQL_HOST','localhost')}:"
-    f"{os.getenv('MYSQL_PORT',3307)}/"
-    f"{os.getenv('MYSQL_DATABASE','travel_db')}"
-)
-engine = create_engine(url)
+# One engine per regional shard (see shards.py); a single database by default
+engines = shards.connect(shards.get_shards(sys.argv[1:]))
 
 # ---------- 2. report queries ----------
+# Each query returns per-shard partial aggregates (sums and counts rather
+# than averages); the merge spec next to it tells shards.merge_partials how
+# to combine them into the global report.
 reports = {
     # A. Top customers by lifetime spend (with address details)
-    "vip_customers": """
+    #    A customer lives in exactly one region, so each shard's top 15
+    #    already contains every candidate for the global top 15.
+    "vip_customers": ("""
         SELECT  c.user_id,
                 CONCAT(c.First_Name,' ',c.Last_Name) AS customer,
-                ROUND(SUM(p.Amount),2) AS total_spend_usd,
+                SUM(p.Amount) AS total_spend_usd,
                 COUNT(DISTINCT p.payment_id) AS transactions,
                 a.City,
                 a.Country
@@ -54,43 +54,64 @@ reports = {
         GROUP BY c.user_id, c.First_Name, c.Last_Name, a.City, a.Country
         ORDER BY total_spend_usd DESC
         LIMIT 15;
-    """,
+    """, dict(keys=["region", "user_id", "customer", "City", "Country"],
+              sums=["total_spend_usd", "transactions"],
+              decimals={"total_spend_usd": 2},
+              columns=["user_id", "customer", "total_spend_usd", "transactions", "City", "Country"],
+              order_by="total_spend_usd", limit=15)),
     
     # B. Travel preference analysis - which types are most popular
-    "travel_preferences": """
+    "travel_preferences": ("""
         SELECT  ti.Travel_Type,
                 COUNT(*) AS booking_count,
-                ROUND(AVG(ti.Cost)/100, 2) AS avg_cost_usd,
-                ROUND(AVG(ti.Time_hours), 1) AS avg_travel_hours,
-                ROUND(AVG(bt.Num_People), 1) AS avg_group_size
+                SUM(ti.Cost)/100 AS sum_cost_usd,
+                COUNT(ti.Cost) AS n_cost,
+                SUM(ti.Time_hours) AS sum_travel_hours,
+                COUNT(ti.Time_hours) AS n_travel_hours,
+                SUM(bt.Num_People) AS sum_group_size,
+                COUNT(bt.Num_People) AS n_group_size
         FROM    Transportation_Info ti
         JOIN    Basic_Travel bt USING (transportation_id)
-        GROUP BY ti.Travel_Type
-        ORDER BY booking_count DESC;
-    """,
+        GROUP BY ti.Travel_Type;
+    """, dict(keys=["Travel_Type"],
+              sums=["booking_count"],
+              avgs={"avg_cost_usd": ("sum_cost_usd", "n_cost"),
+                    "avg_travel_hours": ("sum_travel_hours", "n_travel_hours"),
+                    "avg_group_size": ("sum_group_size", "n_group_size")},
+              decimals={"avg_cost_usd": 2, "avg_travel_hours": 1, "avg_group_size": 1},
+              order_by="booking_count")),
     
     # C. Destination popularity by state
-    "popular_destinations": """
+    #    The same state can appear in several regions, so shards return every
+    #    state and the top 10 is only taken after merging.
+    "popular_destinations": ("""
         SELECT  bt.State,
                 COUNT(*) AS visitor_count,
-                ROUND(AVG(bt.Budget)/100, 2) AS avg_budget_usd,
-                ROUND(AVG(bt.Num_People), 1) AS avg_group_size
+                SUM(bt.Budget)/100 AS sum_budget_usd,
+                COUNT(bt.Budget) AS n_budget,
+                SUM(bt.Num_People) AS sum_group_size,
+                COUNT(bt.Num_People) AS n_group_size
         FROM    Basic_Travel bt
         WHERE   bt.State IS NOT NULL AND bt.State != ''
-        GROUP BY bt.State
-        ORDER BY visitor_count DESC
-        LIMIT 10;
-    """,
+        GROUP BY bt.State;
+    """, dict(keys=["State"],
+              sums=["visitor_count"],
+              avgs={"avg_budget_usd": ("sum_budget_usd", "n_budget"),
+                    "avg_group_size": ("sum_group_size", "n_group_size")},
+              decimals={"avg_budget_usd": 2, "avg_group_size": 1},
+              order_by="visitor_count", limit=10)),
     
     # D. Monthly payment trends
-    "monthly_revenue": """
+    "monthly_revenue": ("""
         SELECT  DATE_FORMAT(p.Payment_Date, '%Y-%m') AS month,
-                ROUND(SUM(p.Amount), 2) AS monthly_revenue,
+                SUM(p.Amount) AS monthly_revenue,
                 COUNT(*) AS transaction_count
         FROM    Payment p
-        GROUP BY DATE_FORMAT(p.Payment_Date, '%Y-%m')
-        ORDER BY month;
-    """
+        GROUP BY DATE_FORMAT(p.Payment_Date, '%Y-%m');
+    """, dict(keys=["month"],
+              sums=["monthly_revenue", "transaction_count"],
+              decimals={"monthly_revenue": 2},
+              order_by="month", ascending=True))
 }
 
 # ---------- 3. fetch + visualize + save ----------
@@ -98,9 +119,9 @@ timestamp = datetime.now().strftime("%Y%m%d_%H%M")
 output_file = os.path.join(REPORTS_DIR, f"travel_insights_{timestamp}.xlsx")
 
 with pd.ExcelWriter(output_file) as writer:
-    for sheet, sql in reports.items():
+    for sheet, (sql, merge) in reports.items():
         print(f"Generating {sheet} report...")
-        df = pd.read_sql(sql, engine)
+        df = shards.run_report(engines, sql, **merge)
         df.to_excel(writer, sheet_name=sheet, index=False)
         
         # Create visualizations based on report type
@@ -193,27 +214,29 @@ with pd.ExcelWriter(output_file) as writer:
 
 # Create an executive summary with key metrics
 print("Generating executive summary...")
-with engine.connect() as conn:
-    # Total customers
-    total_customers = pd.read_sql("SELECT COUNT(*) AS total FROM Customer", conn).iloc[0, 0]
-    
-    # Total revenue
-    total_revenue = pd.read_sql("SELECT ROUND(SUM(Amount), 2) AS total FROM Payment", conn).iloc[0, 0]
-    
-    # Average trip duration
-    avg_trip_days = pd.read_sql("""
-        SELECT ROUND(AVG(DATEDIFF(end_date, start_date)), 1) AS avg_days 
-        FROM Trips
-    """, conn).iloc[0, 0]
-    
-    # Most popular travel type
-    pop_travel_type = pd.read_sql("""
-        SELECT Travel_Type, COUNT(*) AS count
-        FROM Transportation_Info
-        GROUP BY Travel_Type
-        ORDER BY count DESC
-        LIMIT 1
-    """, conn).iloc[0, 0]
+# Total customers
+total_customers = int(shards.run_report(engines, """
+    SELECT COUNT(*) AS total FROM Customer
+""", sums=["total"]).iloc[0, 0])
+
+# Total revenue
+total_revenue = shards.run_report(engines, """
+    SELECT SUM(Amount) AS total FROM Payment
+""", sums=["total"], decimals={"total": 2}).iloc[0, 0]
+
+# Average trip duration
+avg_trip_days = shards.run_report(engines, """
+    SELECT SUM(DATEDIFF(end_date, start_date)) AS sum_days,
+           COUNT(DATEDIFF(end_date, start_date)) AS n_days
+    FROM Trips
+""", avgs={"avg_days": ("sum_days", "n_days")}, decimals={"avg_days": 1}).iloc[0, 0]
+
+# Most popular travel type
+pop_travel_type = shards.run_report(engines, """
+    SELECT Travel_Type, COUNT(*) AS count
+    FROM Transportation_Info
+    GROUP BY Travel_Type
+""", keys=["Travel_Type"], sums=["count"], order_by="count", limit=1).iloc[0, 0]
 
 # Create a summary sheet with the key metrics
 summary_df = pd.DataFrame({
@@ -226,4 +249,5 @@ with pd.ExcelWriter(output_file, mode='a') as writer:
     summary_df.to_excel(writer, sheet_name='Executive_Summary', index=False)
 
 print(f"✅ Reports and visualizations complete! Output saved to {output_file}")
-print(f"   PNG charts also available in the {REPORTS_DIR} directory") 
\ No newline at end of file
+print(f"   PNG charts also available in the {REPORTS_DIR} directory")
+print(f"   Merged across {len(engines)} shard(s): {', '.join(engines)}") 
\ No newline at end of file
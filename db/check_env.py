@@ -137,6 +137,7 @@ def check_scripts_executable():
         'run_all.sh',
         'setup_all.sh',
         'start_db.sh',
+        'start_shards.sh',
         'install_report_deps.sh'
     ]
     
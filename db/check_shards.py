@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Shard Merge Check for Travel Database Project
+This script verifies the partial-aggregate merge in shards.py using
+in-memory data, so it runs without Docker or a database.
+"""
+
+import sys
+
+import pandas as pd
+
+from check_env import Colors, print_status
+from shards import REGION_COL, merge_partials
+
+def check_avg_rebuild():
+    """Check that averages come from summed sums and counts, not averages of averages"""
+    # east: 1 booking costing 100, west: 3 bookings costing 300 each
+    partials = pd.DataFrame({
+        REGION_COL: ['east', 'west'],
+        'Travel_Type': ['Train', 'Train'],
+        'booking_count': [1, 3],
+        'sum_cost_usd': [100.0, 900.0],
+        'n_cost': [1, 3],
+    })
+    merged = merge_partials(partials, keys=['Travel_Type'], sums=['booking_count'],
+                            avgs={'avg_cost_usd': ('sum_cost_usd', 'n_cost')},
+                            decimals={'avg_cost_usd': 2})
+
+    row = merged.iloc[0]
+    if list(merged.columns) != ['Travel_Type', 'booking_count', 'avg_cost_usd'] \
+            or row['booking_count'] != 4 or row['avg_cost_usd'] != 250.0:
+        print_status("AVG Rebuild", "ERROR",
+                    f"Expected 4 bookings at 250.00 (not 200.00), got:\n{merged}")
+        return False
+    print_status("AVG Rebuild", "OK", "Average rebuilt from sum and count (250.00, not 200.00)")
+    return True
+
+def check_global_top_n():
+    """Check that top-N is taken after merging states that appear in several shards"""
+    # 'CA' is not in any single shard's top 2, but is the busiest state overall
+    partials = pd.DataFrame({
+        REGION_COL: ['east', 'east', 'east', 'west', 'west', 'west'],
+        'State':    ['NY',   'FL',   'CA',   'TX',   'WA',   'CA'],
+        'visitor_count': [10, 9, 8, 10, 9, 8],
+        'sum_budget_usd': [100.0, 90.0, 80.0, 100.0, 90.0, 160.0],
+        'n_budget': [10, 9, 8, 10, 9, 8],
+    })
+    merged = merge_partials(partials, keys=['State'], sums=['visitor_count'],
+                            avgs={'avg_budget_usd': ('sum_budget_usd', 'n_budget')},
+                            order_by='visitor_count', limit=2)
+
+    top = merged.iloc[0]
+    if top['State'] != 'CA' or top['visitor_count'] != 16 or top['avg_budget_usd'] != 15.0 \
+            or len(merged) != 2:
+        print_status("Global Top-N", "ERROR",
+                    f"Expected CA first with 16 visitors averaging 15.00, got:\n{merged}")
+        return False
+
+    # Customers keep their region in the key, so equal user_ids stay separate
+    customers = pd.DataFrame({
+        REGION_COL: ['east', 'west'],
+        'user_id': [1, 1],
+        'total_spend_usd': [50.0, 70.0],
+    })
+    merged = merge_partials(customers, keys=[REGION_COL, 'user_id'], sums=['total_spend_usd'],
+                            order_by='total_spend_usd', limit=20)
+    if merged[REGION_COL].tolist() != ['west', 'east'] or merged['total_spend_usd'].tolist() != [70.0, 50.0]:
+        print_status("Global Top-N", "ERROR",
+                    f"Expected user 1 of west then east kept apart, got:\n{merged}")
+        return False
+
+    print_status("Global Top-N", "OK", "Top-N re-ranked over states merged across shards")
+    return True
+
+def check_null_keys_and_sums():
+    """Check that NULL group keys are kept and all-NULL sums stay NULL"""
+    partials = pd.DataFrame({
+        REGION_COL: ['east', 'west', 'west'],
+        'City': [None, None, 'Lyon'],
+        'total_spend_usd': [None, None, 12.5],
+        'transactions': [2, 3, 1],
+    })
+    merged = merge_partials(partials, keys=['City'], sums=['total_spend_usd', 'transactions'])
+
+    null_city = merged[merged['City'].isna()]
+    if len(merged) != 2 or len(null_city) != 1 \
+            or null_city['transactions'].iloc[0] != 5 \
+            or not pd.isna(null_city['total_spend_usd'].iloc[0]):
+        print_status("NULL Handling", "ERROR",
+                    f"Expected one NULL City group with 5 transactions and NULL spend, got:\n{merged}")
+        return False
+    print_status("NULL Handling", "OK", "NULL group keys kept; all-NULL sums stay NULL")
+    return True
+
+def check_empty_shard():
+    """Check that an empty shard does not leave merged counts non-numeric"""
+    populated = pd.DataFrame({
+        REGION_COL: ['east'],
+        'Travel_Type': ['Train'],
+        'booking_count': [3],
+    })
+    # read_sql gives object columns when a query returns no rows
+    empty = pd.DataFrame({col: pd.Series([], dtype=object) for col in populated.columns})
+    partials = pd.concat([populated, empty], ignore_index=True)
+    merged = merge_partials(partials, keys=['Travel_Type'], sums=['booking_count'])
+
+    if merged['booking_count'].dtype.kind not in "fi" or merged['booking_count'].iloc[0] != 3:
+        print_status("Empty Shard", "ERROR",
+                    f"Expected numeric booking_count of 3, got dtype {merged['booking_count'].dtype}")
+        return False
+    print_status("Empty Shard", "OK", "Counts stay numeric when a shard returns no rows")
+    return True
+
+def check_rounding():
+    """Check that merged values round half away from zero, like MySQL ROUND()"""
+    # 1.125 and an average of 46.295 are not exact in binary floating point
+    partials = pd.DataFrame({
+        REGION_COL: ['east', 'west'],
+        'State': ['NY', 'NY'],
+        'total_usd': [0.125, 1.0],
+        'sum_budget_usd': [46.29, 46.3],
+        'n_budget': [1, 1],
+    })
+    merged = merge_partials(partials, keys=['State'], sums=['total_usd'],
+                            avgs={'avg_budget_usd': ('sum_budget_usd', 'n_budget')},
+                            decimals={'total_usd': 2, 'avg_budget_usd': 2})
+
+    row = merged.iloc[0]
+    if row['total_usd'] != 1.13 or row['avg_budget_usd'] != 46.3:
+        print_status("Rounding", "ERROR",
+                    f"Expected 1.13 and 46.30, got:\n{merged}")
+        return False
+    print_status("Rounding", "OK", "Half away from zero (1.125 -> 1.13, 46.295 -> 46.30)")
+    return True
+
+def main():
+    """Run all shard merge checks"""
+    print(f"\n{Colors.BOLD}Travel Database Project - Shard Merge Check{Colors.END}\n")
+
+    results = {
+        'avg': check_avg_rebuild(),
+        'top_n': check_global_top_n(),
+        'nulls': check_null_keys_and_sums(),
+        'empty': check_empty_shard(),
+        'rounding': check_rounding(),
+    }
+
+    if all(results.values()):
+        print(f"{Colors.GREEN}{Colors.BOLD}✓ Shard merge checks passed{Colors.END}\n")
+        return 0
+    print(f"{Colors.RED}{Colors.BOLD}✗ Shard merge checks failed{Colors.END}\n")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Shard helpers for running the travel reports across regional databases.
+
+Each region runs its own travel_db. The report scripts send a "partial"
+query to every shard in parallel and merge the results here: SUM/COUNT
+columns are added back together, averages are rebuilt from their sum and
+count (never by averaging averages), and top-N lists are re-ranked over
+the combined rows.
+
+Shards are listed as ``[region=]host[:port][/database]`` entries, either on
+the command line or comma-separated in MYSQL_SHARDS, e.g.
+
+    MYSQL_SHARDS="east=localhost:3307,west=localhost:3308"
+
+With neither set, the usual MYSQL_HOST/MYSQL_PORT/MYSQL_DATABASE settings
+give a single shard and the reports keep the layout and values they had
+before, including MySQL's half-away-from-zero rounding.
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_HALF_UP
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+REGION_COL = "region"
+
+# "region=endpoint"; the region is a plain name, so a bare URL whose query
+# string or password contains "=" is never mistaken for a region prefix
+_REGION_ENTRY = re.compile(r"^(\w[\w-]*)=(.*)$")
+
+
+def _shard_url(endpoint):
+    """Build a SQLAlchemy URL for a ``host[:port][/database]`` endpoint."""
+    if "://" in endpoint:
+        return endpoint
+    hostport, _, database = endpoint.partition("/")
+    host, _, port = hostport.partition(":")
+    return (
+        f"mysql+mysqlconnector://{os.getenv('MYSQL_USER','travel_admin')}:"
+        f"{os.getenv('MYSQL_PASSWORD','travel_pw')}@"
+        f"{host or os.getenv('MYSQL_HOST','localhost')}:"
+        f"{port or os.getenv('MYSQL_PORT',3307)}/"
+        f"{database or os.getenv('MYSQL_DATABASE','travel_db')}"
+    )
+
+
+def _to_decimal(value):
+    """Convert a SUM/COUNT value to Decimal via its shortest text form."""
+    return Decimal(str(value))
+
+
+def _round_half_up(value, digits):
+    """Round like MySQL ROUND() on DECIMAL: half away from zero."""
+    if pd.isna(value):
+        return value
+    return float(_to_decimal(value).quantize(Decimal(1).scaleb(-digits),
+                                             rounding=ROUND_HALF_UP))
+
+
+def _region_name(url):
+    """Name an unlabelled shard ``host:port/database``, leaving out credentials."""
+    url = make_url(url)
+    return f"{url.host}:{url.port}/{url.database}"
+
+
+def get_shards(endpoints=None):
+    """Return an ordered {region: url} dict for the configured shards."""
+    if not endpoints:
+        endpoints = [e for e in os.getenv("MYSQL_SHARDS", "").split(",") if e.strip()]
+    if not endpoints:
+        endpoints = [""]
+
+    shards, seen = {}, {}
+    for entry in endpoints:
+        entry = entry.strip()
+        match = _REGION_ENTRY.match(entry)
+        if match:
+            region, endpoint = match.group(1), match.group(2).strip()
+            if not endpoint:
+                raise ValueError(f"Shard region '{region}' has no endpoint")
+        else:
+            region, endpoint = "", entry
+        url = _shard_url(endpoint)
+        region = region or (_region_name(url) if endpoint else "default")
+        if region in shards:
+            raise ValueError(f"Duplicate shard region '{region}'")
+        # Listing one database twice would double every SUM/COUNT
+        target = _region_name(url)
+        if target in seen:
+            raise ValueError(f"Shards '{seen[target]}' and '{region}' both point at {target}")
+        seen[target] = region
+        shards[region] = url
+    return shards
+
+
+def connect(shards):
+    """Create one engine per shard."""
+    return {region: create_engine(url) for region, url in shards.items()}
+
+
+def fetch_partials(engines, sql):
+    """Run ``sql`` on every shard in parallel and stack the results.
+
+    Each row is tagged with the region it came from. A failing shard aborts
+    the whole report, since a merge that silently skipped a region would be
+    wrong rather than partial.
+    """
+    def fetch(region, engine):
+        try:
+            df = pd.read_sql(sql, engine)
+        except Exception as exc:
+            raise RuntimeError(f"Report query failed on shard '{region}'") from exc
+        df.insert(0, REGION_COL, region)
+        return df
+
+    with ThreadPoolExecutor(max_workers=len(engines)) as pool:
+        frames = list(pool.map(fetch, engines.keys(), engines.values()))
+    return pd.concat(frames, ignore_index=True)
+
+
+def merge_partials(df, keys=(), sums=(), avgs=None, decimals=None,
+                   order_by=None, ascending=False, limit=None, columns=None):
+    """Re-aggregate stacked partial results into the global report.
+
+    keys      -- columns to group on (empty for a single summary row)
+    sums      -- SUM/COUNT columns that are added across shards
+    avgs      -- {output_col: (sum_col, count_col)}; the sum/count helper
+                 columns are dropped once the average is computed
+    decimals  -- {col: digits} rounding applied after merging, half away
+                 from zero like MySQL ROUND()
+    order_by  -- column(s) to sort on, then ``limit`` keeps the global top-N
+    columns   -- final column order (the region column always leads)
+    """
+    keys, avgs = list(keys), avgs or {}
+    add_cols = list(dict.fromkeys(list(sums) + [c for pair in avgs.values() for c in pair]))
+
+    # min_count=1 keeps a group whose shards all returned NULL as NULL,
+    # just like a single SUM over every shard's rows would
+    if keys:
+        merged = (df.groupby(keys, sort=True, dropna=False)[add_cols]
+                    .sum(min_count=1).reset_index())
+    else:
+        merged = df[add_cols].sum(min_count=1).to_frame().T
+
+    # Averages are divided in Decimal so that rounding below sees the exact
+    # quotient, as MySQL's AVG on DECIMAL would, rather than a float near it
+    helper_cols = []
+    for out_col, (sum_col, count_col) in avgs.items():
+        merged[out_col] = [
+            _to_decimal(total) / _to_decimal(count)
+            if pd.notna(total) and pd.notna(count) and count > 0 else None
+            for total, count in zip(merged[sum_col], merged[count_col])
+        ]
+        helper_cols += [sum_col, count_col]
+    merged = merged.drop(columns=[c for c in helper_cols if c not in sums])
+
+    for col, digits in (decimals or {}).items():
+        merged[col] = [_round_half_up(v, digits) for v in merged[col]]
+
+    # An empty shard comes back from read_sql with object columns, which
+    # would otherwise leave the merged counts non-numeric; unrounded
+    # averages are still Decimal objects at this point
+    for col in sums:
+        merged[col] = pd.to_numeric(merged[col])
+    for col in avgs:
+        merged[col] = pd.to_numeric(merged[col].map(float, na_action="ignore"))
+
+    if columns is not None:
+        lead = [REGION_COL] if REGION_COL in merged.columns and REGION_COL not in columns else []
+        merged = merged[lead + list(columns)]
+    if order_by is not None:
+        merged = merged.sort_values(order_by, ascending=ascending, kind="stable")
+    if limit is not None:
+        merged = merged.head(limit)
+    return merged.reset_index(drop=True)
+
+
+def run_report(engines, sql, **merge):
+    """Fan ``sql`` out to every shard and merge the partials.
+
+    The region column is only kept when there is more than one shard, so a
+    single-database run produces the same sheet layout as before.
+    """
+    merged = merge_partials(fetch_partials(engines, sql), **merge)
+    if len(engines) == 1 and REGION_COL in merged.columns:
+        merged = merged.drop(columns=REGION_COL)
+    return merged
@@ -0,0 +1,66 @@
+#!/bin/bash
+
+# Start one seeded MySQL container per region so the reports can be run
+# against several local shards, e.g.  ./start_shards.sh east west north
+
+echo "🌍 Setting up regional travel_db shards"
+
+# Check if Docker is running
+if ! docker info > /dev/null 2>&1; then
+  echo "❌ Docker is not running. Please start Docker Desktop and try again."
+  exit 1
+fi
+
+# Load environment variables
+if [ -f .env ]; then
+  export $(cat .env | grep -v '#' | sed 's/\r$//' | xargs)
+fi
+
+MYSQL_USER=${MYSQL_USER:-travel_admin}
+MYSQL_PASSWORD=${MYSQL_PASSWORD:-travel_pw}
+MYSQL_DATABASE=${MYSQL_DATABASE:-travel_db}
+
+REGIONS=${@:-east west}
+# Leave the default single-database port free for setup_all.sh
+PORT=${SHARD_BASE_PORT:-3310}
+SHARDS=""
+
+for REGION in $REGIONS; do
+  NAME=travel-mysql-$REGION
+
+  if docker ps -a --format '{{.Names}}' | grep -qx "$NAME"; then
+    echo "🔄 Removing existing $NAME container..."
+    docker rm -f $NAME > /dev/null
+  fi
+
+  echo "🚀 Starting $NAME on port $PORT..."
+  docker run -d --name $NAME \
+    -p $PORT:3306 \
+    -e MYSQL_ROOT_PASSWORD=root_pw \
+    -e MYSQL_DATABASE=$MYSQL_DATABASE \
+    -e MYSQL_USER=$MYSQL_USER \
+    -e MYSQL_PASSWORD=$MYSQL_PASSWORD \
+    mysql:8.0 > /dev/null
+
+  SHARDS="$SHARDS,$REGION=localhost:$PORT"
+  PORT=$((PORT + 1))
+done
+
+echo "⏳ Waiting for MySQL to initialize (15 seconds)..."
+sleep 15
+
+PORT=${SHARD_BASE_PORT:-3310}
+for REGION in $REGIONS; do
+  NAME=travel-mysql-$REGION
+
+  echo "📝 Creating schema and seeding $REGION..."
+  docker exec -i $NAME \
+    mysql -u$MYSQL_USER -p$MYSQL_PASSWORD $MYSQL_DATABASE < schema.sql
+  MYSQL_HOST=localhost MYSQL_PORT=$PORT python3 seed_db.py
+
+  PORT=$((PORT + 1))
+done
+
+echo "✅ Shards ready! Run the reports across all of them with:"
+echo "   MYSQL_SHARDS=\"${SHARDS#,}\" python3 make_reports.py"
+echo "   MYSQL_SHARDS=\"${SHARDS#,}\" python3 advanced_reports.py"